@@ -1,26 +1,30 @@
-from influx import query
 from utils import indentprint
 
 SEARCH_WINDOW = "7d"
 
 
-def get_avg_cpu(job_id):
+def avg_cpu_query(job_id):
     """
-    Query Influx for CPU usage and calculate the average
+    Build the Flux query for the average CPU usage
     """
 
-    job_query = f"""
+    return f"""
     from(bucket: "jobmon-stats")
     |> range(start: -{SEARCH_WINDOW})
     |> filter(fn: (r) => r["_measurement"] == "average_cpu_usage")
     |> filter(fn: (r) => r["job_id"] == "{job_id}")
     |> mean()
+    |> keep(columns: ["_value"])
     """
 
-    job_results = query(job_query)
 
-    if len(job_results) > 0:
-        return job_results[0].records[0].get_value()
+def parse_avg_cpu(records):
+    """
+    Get the average CPU usage from the query records
+    """
+
+    if len(records) > 0:
+        return records[0].get_value()
     else:
         return None
 
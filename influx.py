@@ -1,4 +1,5 @@
 import influx_config
+from datetime import datetime, timezone
 from influxdb_client import InfluxDBClient
 
 # Create the file influx_config.py with the following content:
@@ -6,6 +7,8 @@ from influxdb_client import InfluxDBClient
 # URL = "http://influxdb:8086"
 # ORG = "swinburne"
 # TOKEN = "<read only token>"
+# # Optional bucket maintained by job_peaks.flux
+# PEAKS_BUCKET = "job_peaks"
 
 
 influx_client = InfluxDBClient(
@@ -19,5 +22,27 @@ influx_client = InfluxDBClient(
 influx_query_api = influx_client.query_api()
 
 
-def query(query):
-    return influx_query_api.query(query, org=influx_config.ORG)
+def query_stream(query):
+    """Stream the records of a query, without building FluxTable objects"""
+    return influx_query_api.query_stream(query, org=influx_config.ORG)
+
+
+def time_range(start_time=None, end_time=None, window="7d", buffer=60):
+    """
+    Build a Flux range() covering the given Unix timestamps (padded by buffer
+    seconds), falling back to the last window if the start is unknown
+    """
+
+    def to_rfc3339(timestamp):
+        return datetime.fromtimestamp(timestamp, timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%SZ"
+        )
+
+    if start_time is None:
+        return f"range(start: -{window})"
+    if end_time is None:
+        return f"range(start: {to_rfc3339(start_time - buffer)})"
+    return (
+        f"range(start: {to_rfc3339(start_time - buffer)}, "
+        f"stop: {to_rfc3339(end_time + buffer)})"
+    )
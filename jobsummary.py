@@ -1,40 +1,50 @@
 from sacct import call_sacct
-from lustre import get_summary, print_lustre_summary
-from memory import get_max_mem, get_req_mem, print_mem_summary
-from cpu import get_avg_cpu, print_cpu_summary
+from stats import get_job_stats
+from lustre import print_lustre_summary
+from memory import get_req_mem, get_mem_fraction, print_mem_summary
+from cpu import print_cpu_summary
 from runtime import print_time_summary
 from warn import print_warnings
 from utils import Timeout
 import argparse
 
 
-def summary(job_id):
-    # Call sacct to get stats
-    saact_data = call_sacct(job_id)
+def summary(job_id, sacct_data=None, include_lustre=True):
+    # Call sacct to get stats, unless they have already been loaded
+    if sacct_data is None:
+        sacct_data = call_sacct(job_id)
 
-    # Get the Lustre summary
-    summary = get_summary(job_id)
+    # Get the memory, CPU and Lustre stats from Influx in one query, unless the
+    # job never started (e.g. cancelled while pending) and so has no stats
+    if sacct_data["start"] is None:
+        stats = {"max_mem": None, "avg_cpu": None, "lustre": {}}
+    else:
+        stats = get_job_stats(
+            job_id, sacct_data["start"], sacct_data["end"], include_lustre
+        )
 
     # Print the Lustre summary
-    print_lustre_summary(summary)
-    print()
+    if include_lustre:
+        print_lustre_summary(stats["lustre"])
+        print()
 
-    max_mem = get_max_mem(job_id)
-    req_mem = get_req_mem(saact_data)
-    print_mem_summary(max_mem, req_mem)
+    max_mem = stats["max_mem"]
+    req_mem = get_req_mem(sacct_data)
+    mem_fraction = get_mem_fraction(max_mem, req_mem)
+    print_mem_summary(max_mem, req_mem, mem_fraction)
 
     # Get the average CPU usage
     print()
-    avg_cpu = get_avg_cpu(job_id)
+    avg_cpu = stats["avg_cpu"]
     print_cpu_summary(avg_cpu)
 
     # Print time summary
     print()
-    print_time_summary(saact_data)
+    print_time_summary(sacct_data)
 
     # Print warnings
     print()
-    print_warnings(max_mem, req_mem, avg_cpu)
+    print_warnings(mem_fraction, avg_cpu)
 
 
 def main():
@@ -45,6 +55,11 @@ def main():
         description="Print out a summary of the job", prog="jobsummary"
     )
     parser.add_argument("job_id", type=str, help="Job ID")
+    parser.add_argument(
+        "--no-lustre",
+        action="store_true",
+        help="Do not query or print the Lustre filesystem summary",
+    )
     args = parser.parse_args()
 
     print()
@@ -52,7 +67,7 @@ def main():
     # Set a timeout to prevent jobs from hanging
     try:
         with Timeout(seconds=30):
-            summary(args.job_id)
+            summary(args.job_id, include_lustre=not args.no_lustre)
     except Exception as e:
         print("Job summary could not be generated (Read timed out)")
 
@@ -1,68 +1,68 @@
-from influx import query
-from utils import humansize, indentprint
-from tabulate import tabulate
+from utils import humansize, indentprint, make_table
 
 SEARCH_WINDOW = "7d"
+FIELDS = ["read_bytes", "write_bytes", "iops"]
 
+# Display paths of the filesystems and the summary table headers
+FS_NAMES = {"dagg": "/fred", "home": "/home", "apps": "/apps", "images": "OS"}
+HEADERS = ["Path", "Total Read", "Total Write", "Total I/O Operations"]
 
-def get_lustre_jobstats(job_id):
+
+def lustre_jobstats_query(job_id):
     """
-    Query Influx for the Lustre jobstats
+    Build the Flux query for the Lustre jobstats
     """
 
-    job_query = f"""
+    # Match the fields with an equality chain, which Influx can push down to
+    # the storage engine (unlike contains())
+    field_filter = " or ".join(f'r["_field"] == "{field}"' for field in FIELDS)
+
+    # Fetch the last value of each field for every filesystem/server in a
+    # single query, pivoted so each row holds all fields for one server
+    return f"""
     from(bucket: "lustre-jobstats")
     |> range(start: -{SEARCH_WINDOW})
     |> filter(fn: (r) => r["_measurement"] == "lustre")
     |> filter(fn: (r) => r["job"] == "{job_id}")
+    |> filter(fn: (r) => {field_filter})
+    |> group(columns: ["fs", "server", "_field"])
     |> last()
+    |> drop(columns: ["_start", "_stop", "_time", "host"])
+    |> group(columns: ["fs", "server"])
+    |> pivot(rowKey: ["fs", "server"], columnKey: ["_field"], valueColumn: "_value")
     """
 
-    job_results = query(job_query)
-
-    data = {}
-
-    for table in job_results:
 
-        fs = table.records[0]["fs"]
-        server = table.records[0]["server"]
-        field = table.records[0].get_field()
+def parse_lustre_jobstats(records):
+    """
+    Get the last value of each Lustre jobstat from the query records, keyed by
+    (fs, server, field)
+    """
 
-        if fs not in data:
-            data[fs] = {}
-        if server not in data[fs]:
-            data[fs][server] = {}
-        if field not in data[fs][server]:
-            data[fs][server][field] = {"ts": [], "value": []}
+    data = {}
 
-        for record in table:
-            ts = int(record.get_time().timestamp())
-            data[fs][server][field]["ts"] += [ts]
-            data[fs][server][field]["value"] += [record.get_value()]
+    for record in records:
+        values = record.values
+        for field in FIELDS:
+            value = values.get(field)
+            if value is not None:
+                data[(values["fs"], values["server"], field)] = value
 
     return data
 
 
-def get_summary(job_id):
-    """Get a summary of the job (final values)"""
-    data = get_lustre_jobstats(job_id)
-
-    def get_last_value(fs, server, field):
-        """Get the last value, but if data is not available, return 0"""
-        try:
-            value = data[fs][server][field]["value"][-1]
-        except KeyError:
-            value = 0
-        return value
+def summarise_jobstats(data):
+    """Summarise the Lustre jobstats (final values)"""
 
     summary = {}
 
-    for fs in list(data.keys()):
-        summary[fs] = {}
-
-        summary[fs]["total_read"] = get_last_value(fs, "oss", "read_bytes")
-        summary[fs]["total_write"] = get_last_value(fs, "oss", "write_bytes")
-        summary[fs]["total_iops"] = get_last_value(fs, "mds", "iops")
+    # Filesystems in the order they were returned
+    for fs in dict.fromkeys(fs for fs, _, _ in data):
+        summary[fs] = {
+            "total_read": data.get((fs, "oss", "read_bytes"), 0),
+            "total_write": data.get((fs, "oss", "write_bytes"), 0),
+            "total_iops": data.get((fs, "mds", "iops"), 0),
+        }
 
     return summary
 
@@ -70,13 +70,11 @@ def get_summary(job_id):
 def print_lustre_summary(summary):
     """Print out a summary as a table"""
 
-    fs_names = {"dagg": "/fred", "home": "/home", "apps": "/apps", "images": "OS"}
-
     table = []
     for fs in summary:
         table += [
             [
-                fs_names[fs],
+                FS_NAMES.get(fs, fs),
                 humansize(summary[fs]["total_read"]),
                 humansize(summary[fs]["total_write"]),
                 humansize(summary[fs]["total_iops"], bytes=False),
@@ -84,6 +82,4 @@ def print_lustre_summary(summary):
         ]
 
     print("Lustre Filesystem:")
-    indentprint(
-        tabulate(table, headers=["Path", "Total Read", "Total Write", "Total I/O Operations"])
-    )
+    indentprint(make_table(table, HEADERS))
@@ -1,28 +1,58 @@
-from influx import query
+import time
+import influx_config
+from influx import time_range
 from utils import humansize, bytesize, indentprint
 
+BUCKET = "jobmon-stats"
 SEARCH_WINDOW = "7d"
 
+# Optional bucket of peak memory per job, maintained by the Influx task in
+# job_peaks.flux. The task copies each interval's peaks up to 90s late (every
+# plus offset), so it is only read for jobs that ended PEAKS_DELAY seconds ago
+PEAKS_BUCKET = getattr(influx_config, "PEAKS_BUCKET", None)
+PEAKS_DELAY = 120
 
-def get_max_mem(job_id):
+
+def max_mem_bucket(end_time):
     """
-    Query Influx for slurm memory stats
+    Get the bucket to read the peak memory of a job from
     """
+    if (
+        PEAKS_BUCKET is not None
+        and end_time is not None
+        and end_time < time.time() - PEAKS_DELAY
+    ):
+        return PEAKS_BUCKET
+    return BUCKET
+
 
-    # Query for the max memory usage of any node in the job
-    job_query = f"""
-    from(bucket: "jobmon-stats")
-    |> range(start: -{SEARCH_WINDOW})
+def max_mem_query(job_id, start_time=None, end_time=None, bucket=BUCKET):
+    """
+    Build the Flux query for slurm memory stats, limited to the job's runtime
+    if the start and end times are known
+    """
+
+    # Query for the max memory usage of any node in the job, converted from
+    # MB to B by Influx
+    return f"""
+    from(bucket: "{bucket}")
+    |> {time_range(start_time, end_time, SEARCH_WINDOW)}
     |> filter(fn: (r) => r["_measurement"] == "job_max_memory")
     |> filter(fn: (r) => r["job_id"] == "{job_id}")
-    |> last()
+    |> group(columns: ["job_id"])
+    |> max()
+    |> map(fn: (r) => ({{_value: float(v: r._value) * 1048576.0}}))
+    |> keep(columns: ["_value"])
     """
 
-    job_results = query(job_query)
 
-    if len(job_results) > 0:
-        # Get the max value and convert MB to B
-        return job_results[0].records[0].get_value() * 1024 ** 2
+def parse_max_mem(records):
+    """
+    Get the max memory in bytes from the query records
+    """
+
+    if len(records) > 0:
+        return records[0].get_value()
     else:
         return None
 
@@ -41,7 +71,16 @@ def get_req_mem(sacct_data):
     return mem_per_node
 
 
-def print_mem_summary(max_mem, requested_mem):
+def get_mem_fraction(max_mem, req_mem):
+    """
+    Get the fraction of the requested memory used, if known
+    """
+    if max_mem is None or req_mem is None:
+        return None
+    return max_mem / req_mem
+
+
+def print_mem_summary(max_mem, requested_mem, mem_fraction):
     """
     Print a summary of the memory usage
     """
@@ -50,6 +89,4 @@ def print_mem_summary(max_mem, requested_mem):
     if max_mem is None:
         indentprint("No memory usage data available")
     else:
-        indentprint(
-            f"Peak:      {humansize(max_mem)} ({100*max_mem/requested_mem:.1f}%)"
-        )
+        indentprint(f"Peak:      {humansize(max_mem)} ({100*mem_fraction:.1f}%)")
@@ -1,6 +1,8 @@
+import functools
 from utils import indentprint
 
 
+@functools.lru_cache(maxsize=1024)
 def time_to_seconds(time_string):
     if "-" in time_string:
         days, time = time_string.split("-")
@@ -32,9 +34,18 @@ def print_time_summary(sacct_data):
         else:
             elapsed_string = elapsed_string.rjust(len(limit_string), " ")
 
-    # Fraction of time used
-    frac = time_to_seconds(elapsed_string) / time_to_seconds(limit_string)
-
     print("Time:")
     indentprint(f"Requested: {limit_string}")
-    indentprint(f"Elapsed:   {elapsed_string} ({100*frac:.1f}%)")
+
+    # Fraction of time used, if there is a limit to compare against (sacct
+    # reports no limit as e.g. "UNLIMITED" or "Partition_Limit")
+    try:
+        limit_seconds = time_to_seconds(limit_string)
+    except ValueError:
+        limit_seconds = 0
+
+    if limit_seconds > 0:
+        frac = time_to_seconds(elapsed_string) / limit_seconds
+        indentprint(f"Elapsed:   {elapsed_string} ({100*frac:.1f}%)")
+    else:
+        indentprint(f"Elapsed:   {elapsed_string}")
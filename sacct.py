@@ -1,21 +1,97 @@
+from datetime import datetime
 from utils import cmd
 
 SACCT = "/apps/slurm/latest/bin/sacct"
-FORMAT = "--format=ReqMem,ReqNodes,Elapsed,TimeLimit"
+FIELDS = "ReqMem,ReqNodes,Elapsed,TimeLimit,Start,End"
+FORMAT = f"--format={FIELDS}"
+
+# Stats of finished jobs, which no longer change, keyed by job ID
+CACHE_SIZE = 256
+finished_jobs = {}
+
+
+def sacct_time_to_timestamp(time_string):
+    """
+    Convert a sacct time to a Unix timestamp, or None if it is not set
+    (e.g. "Unknown" for the end of a running job)
+    """
+    try:
+        return int(datetime.fromisoformat(time_string).timestamp())
+    except ValueError:
+        return None
+
+
+def cache_finished(job_id, data):
+    """
+    Cache the stats of a finished job and return a copy for the caller
+    """
+    if data["end"] is not None:
+        if len(finished_jobs) >= CACHE_SIZE:
+            del finished_jobs[next(iter(finished_jobs))]
+        finished_jobs[job_id] = data
+    return dict(data)
 
 
 def call_sacct(job_id):
     """
-    Call sacct to get stats
+    Call sacct to get stats (finished jobs are cached, as each call is a
+    slurmdbd round-trip)
+    """
+    if job_id in finished_jobs:
+        return dict(finished_jobs[job_id])
+
+    # Only ask for the job allocation, not every step, and parse the first
+    # line (sacct filters array tasks given as <array_id>_<task_id> itself)
+    output = cmd(f"{SACCT} -j {job_id} {FORMAT} --allocations --noheader")
+    line = output.split("\n", 1)[0]
+
+    return cache_finished(job_id, parse_sacct_line(line.split()[0:6]))
+
+
+def call_sacct_many(job_ids):
+    """
+    Call sacct once to get stats for several jobs, returned by job ID
+    """
+    # Finished jobs that are already cached do not need to be queried
+    data = {j: dict(finished_jobs[j]) for j in job_ids if j in finished_jobs}
+    query_ids = [j for j in job_ids if j not in data]
+
+    if not query_ids:
+        return data
+
+    output = cmd(
+        f"{SACCT} -j {','.join(query_ids)} --format=JobID%30,{FIELDS} "
+        "--allocations --noheader"
+    )
+
+    wanted = set(query_ids)
+    for line in output.splitlines():
+        fields = line.split()
+        if len(fields) >= 7 and fields[0] in wanted:
+            data[fields[0]] = cache_finished(fields[0], parse_sacct_line(fields[1:7]))
+
+    # Jobs that sacct reports under a different ID (e.g. the tasks of an
+    # array job) are looked up individually
+    for job_id in job_ids:
+        if job_id not in data:
+            data[job_id] = call_sacct(job_id)
+
+    return data
+
+
+def parse_sacct_line(fields):
+    """
+    Get the stats from the fields of a line of sacct output
     """
-    output = cmd(f"{SACCT} -j {job_id} {FORMAT} --noheader")
-    req_mem, req_nodes, elapsed, time_limit = output.split()[0:4]
+    req_mem, req_nodes, elapsed, time_limit, start, end = fields
 
     data = {
         "req_mem": req_mem,
         "req_nodes": req_nodes,
         "elapsed": elapsed,
         "time_limit": time_limit,
+        "start": sacct_time_to_timestamp(start),
+        "end": sacct_time_to_timestamp(end),
     }
 
     return data
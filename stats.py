@@ -0,0 +1,43 @@
+from influx import query_stream
+from memory import BUCKET, max_mem_bucket, max_mem_query, parse_max_mem
+from cpu import avg_cpu_query, parse_avg_cpu
+from lustre import lustre_jobstats_query, parse_lustre_jobstats, summarise_jobstats
+
+
+def get_job_stats(job_id, start_time=None, end_time=None, include_lustre=True):
+    """
+    Query Influx for the memory, CPU and (optionally) Lustre stats in a single
+    request
+    """
+
+    mem_bucket = max_mem_bucket(end_time)
+
+    # Each pipeline yields its own named result
+    job_query = (
+        max_mem_query(job_id, start_time, end_time, mem_bucket)
+        + '|> yield(name: "mem")\n'
+        + avg_cpu_query(job_id)
+        + '|> yield(name: "cpu")\n'
+    )
+    if include_lustre:
+        job_query += lustre_jobstats_query(job_id) + '|> yield(name: "lustre")\n'
+
+    # Split the streamed records by the result they belong to
+    results = {"mem": [], "cpu": [], "lustre": []}
+    for record in query_stream(job_query):
+        results[record["result"]].append(record)
+
+    # Fall back to the raw stats if the job is missing from the peaks bucket
+    if len(results["mem"]) == 0 and mem_bucket != BUCKET:
+        mem_query = max_mem_query(job_id, start_time, end_time, BUCKET)
+        results["mem"] = list(query_stream(mem_query))
+
+    return {
+        "max_mem": parse_max_mem(results["mem"]),
+        "avg_cpu": parse_avg_cpu(results["cpu"]),
+        "lustre": (
+            summarise_jobstats(parse_lustre_jobstats(results["lustre"]))
+            if include_lustre
+            else None
+        ),
+    }
@@ -1,20 +1,29 @@
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from utils import cmd
+from sacct import call_sacct_many
 from jobsummary import summary
 from tqdm import tqdm
 
+# Number of jobs to summarise at once (each summary is I/O-bound)
+MAX_WORKERS = 8
+
 # Get a list of jobs from squeue
 output = cmd("squeue -o '%i' -h")
 test_jobs = output.splitlines()
 
-for job in tqdm(test_jobs, desc="Testing jobs"):
+# Get the sacct stats for all jobs in one call
+sacct_data = call_sacct_many(test_jobs)
 
-    # Suppress print
-    sys.stdout = open(os.devnull, "w")
+# Suppress print
+sys.stdout = open(os.devnull, "w")
 
-    # Test job
-    summary(job)
+# Test jobs concurrently
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    results = executor.map(summary, test_jobs, [sacct_data[j] for j in test_jobs])
+    for _ in tqdm(results, total=len(test_jobs), desc="Testing jobs"):
+        pass
 
-    # Restore print
-    sys.stdout = sys.__stdout__
+# Restore print
+sys.stdout = sys.__stdout__
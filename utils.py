@@ -1,9 +1,11 @@
+import functools
 import subprocess
 import signal
 
 suffixes = ["", "K", "M", "G", "T", "P"]
 
 
+@functools.lru_cache(maxsize=1024)
 def humansize(nbytes, bytes=True):
     """Convert bytes to human readable format"""
     i = 0
@@ -14,6 +16,7 @@ def humansize(nbytes, bytes=True):
     return f"{f} {suffixes[i]}" + ("B" if bytes else "")
 
 
+@functools.lru_cache(maxsize=1024)
 def bytesize(human):
     """Convert human readable format to bytes"""
 
@@ -27,6 +30,44 @@ def bytesize(human):
     return float(human[:-1]) * 1024 ** power
 
 
+def isnumber(text):
+    """Check if text is a number"""
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def make_table(rows, headers, min_padding=2):
+    """
+    Format rows as a plain text table in the layout of tabulate's default
+    "simple" format: columns are at least min_padding wider than their
+    header, columns of numbers are right-aligned and other cells are stripped
+    """
+    numeric = [
+        len(rows) > 0 and all(isnumber(row[i]) for row in rows)
+        for i in range(len(headers))
+    ]
+    rows = [
+        [cell if right else cell.strip() for cell, right in zip(row, numeric)]
+        for row in rows
+    ]
+    widths = [
+        max([len(header) + min_padding] + [len(row[i]) for row in rows])
+        for i, header in enumerate(headers)
+    ]
+
+    def format_line(line):
+        return "  ".join(
+            cell.rjust(w) if right else cell.ljust(w)
+            for cell, w, right in zip(line, widths, numeric)
+        ).rstrip()
+
+    lines = [headers, ["-" * w for w in widths]] + rows
+    return "\n".join(format_line(line) for line in lines)
+
+
 def cmd(command):
     """Run a command and return the output"""
     return subprocess.check_output(command, shell=True).decode("utf-8").strip()
@@ -1,27 +1,36 @@
 from utils import indentprint
 
+# Checks on the job stats, and the warning shown when each one fails
+WARN_RULES = [
+    (
+        lambda s: s["mem_usage_fraction"] is not None
+        and s["mem_usage_fraction"] < 0.5,
+        "Too much memory requested",
+    ),
+    (
+        lambda s: s["avg_cpu"] is not None and s["avg_cpu"] < 75.0,
+        "CPU usage is low",
+    ),
+]
 
-def print_warnings(max_mem, req_mem, avg_cpu):
+
+def get_warnings(mem_usage_fraction, avg_cpu):
     """
-    Print out any warnings about the job
+    Get the list of warnings about the job
     """
+    stats = {"mem_usage_fraction": mem_usage_fraction, "avg_cpu": avg_cpu}
+    return [message for check, message in WARN_RULES if check(stats)]
 
-    count = 0
-    warnings = []
 
-    mem_usage_fraction = None
-    if max_mem is not None and req_mem is not None:
-        mem_usage_fraction = max_mem / req_mem
-    if mem_usage_fraction is not None and mem_usage_fraction < 0.5:
-        count += 1
-        warnings += ["Too much memory requested"]
+def print_warnings(mem_usage_fraction, avg_cpu):
+    """
+    Print out any warnings about the job
+    """
 
-    if avg_cpu is not None and avg_cpu < 75.0:
-        count += 1
-        warnings += ["CPU usage is low"]
+    warnings = get_warnings(mem_usage_fraction, avg_cpu)
+    count = len(warnings)
 
     if count > 0:
         print("Warnings:")
         indentprint(f"{count} issue{'s' if count > 1 else ''} detected!")
-        for w in warnings:
-            indentprint(f"- {w}")
+        indentprint("\n".join(f"- {w}" for w in warnings))